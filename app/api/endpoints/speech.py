@@ -4,14 +4,26 @@ Text-to-speech endpoint
 
 import io
 import os
+import time
+import struct
+import logging
 import asyncio
-import tempfile
+import hashlib
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import anyio
 import torch
 import torchaudio as ta
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from typing import Optional, List, Dict, Any, AsyncGenerator, Tuple
 from fastapi import APIRouter, HTTPException, status, Form, File, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import numpy as np
+try:
+    import numba
+except ImportError:
+    # Optional: compiled crossfade/quantize kernels, NumPy is used without it
+    numba = None
 from app.models import TTSRequest, ErrorResponse
 from app.config import Config
 from app.core import (
@@ -21,6 +33,12 @@ from app.core import (
 )
 from app.core.tts_model import get_model
 from app.core.text_processing import split_text_for_streaming, get_streaming_settings
+from app.core.voice_uploads import (
+    voice_upload_cacheable, find_voice_upload, voice_upload_tempfile,
+    store_voice_upload, release_voice_upload
+)
+
+logger = logging.getLogger(__name__)
 
 # Create router with aliasing support
 base_router = APIRouter()
@@ -30,7 +48,241 @@ router = add_route_aliases(base_router)
 REQUEST_COUNTER = 0
 
 # Supported audio formats for voice uploads
-SUPPORTED_AUDIO_FORMATS = {'.mp3', '.wav', '.flac', '.m4a', '.ogg'}
+SUPPORTED_AUDIO_FORMATS = frozenset({'.mp3', '.wav', '.flac', '.m4a', '.ogg'})
+
+# Accepted values for the streaming form parameters
+_VALID_STRATS = frozenset({'sentence', 'paragraph', 'fixed', 'word'})
+_VALID_QUAL = frozenset({'fast', 'balanced', 'high'})
+
+# Minimum time between per-chunk progress updates for one request (seconds)
+STATUS_UPDATE_INTERVAL = 0.5
+
+# Voice upload limits: maximum file size and the block size uploads are copied in
+MAX_VOICE_FILE_SIZE = 25 * 1024 * 1024  # 25MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Response headers shared by the streaming endpoints; Starlette copies them
+# into each response, so one dict serves every request
+_STREAM_HEADERS = {
+    "Content-Disposition": "attachment; filename=speech_stream.wav",
+    "Transfer-Encoding": "chunked",
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Disable nginx buffering for true streaming
+}
+
+# Static error payloads, built once instead of per failed request
+_ERR_EMPTY_INPUT = {"error": {"message": "Input text cannot be empty", "type": "invalid_request_error"}}
+_ERR_NO_FILENAME = {"error": {"message": "No filename provided", "type": "invalid_request_error"}}
+_ERR_VOICE_FILE_TOO_LARGE = {
+    "error": {
+        "message": f"File too large. Maximum size: {MAX_VOICE_FILE_SIZE // (1024*1024)}MB",
+        "type": "invalid_request_error"
+    }
+}
+_ERR_NOT_AUDIO = {
+    "error": {
+        "message": f"Uploaded file is not a recognized audio file. Supported formats: {', '.join(sorted(SUPPORTED_AUDIO_FORMATS))}",
+        "type": "invalid_request_error"
+    }
+}
+_ERR_TEXT_TOO_LONG = {
+    "error": {
+        "message": f"Input text too long. Maximum {Config.MAX_TOTAL_LENGTH} characters allowed.",
+        "type": "invalid_request_error"
+    }
+}
+_ERR_MODEL_NOT_LOADED = {"error": {"message": "Model not loaded", "type": "model_error"}}
+_ERR_INVALID_STRATEGY = {"error": {"message": "streaming_strategy must be one of: sentence, paragraph, fixed, word", "type": "validation_error"}}
+_ERR_INVALID_QUALITY = {"error": {"message": "streaming_quality must be one of: fast, balanced, high", "type": "validation_error"}}
+
+# Enumerated streaming form parameters: name -> (accepted values, error payload)
+_PARAM_ENUMS = {
+    'streaming_strategy': (_VALID_STRATS, _ERR_INVALID_STRATEGY),
+    'streaming_quality': (_VALID_QUAL, _ERR_INVALID_QUALITY),
+}
+
+# CUDA availability can't change while the process runs; checked once
+HAS_CUDA: bool = torch.cuda.is_available()
+
+# All model.generate calls go through one worker thread, so concurrent requests
+# never drive the model from several threads at once; on CUDA that thread
+# issues its work on a dedicated stream on the model's device
+TTS_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-gpu")
+_tts_streams: Dict[torch.device, "torch.cuda.Stream"] = {}
+
+
+def _tts_stream(model) -> Optional["torch.cuda.Stream"]:
+    """
+    The TTS CUDA stream for the model's device, or None if it isn't on CUDA.
+
+    Created lazily so non-CUDA deployments never create a CUDA context.
+    """
+    device = torch.device(getattr(model, 'device', 'cpu'))
+    if device.type != 'cuda':
+        return None
+    stream = _tts_streams.get(device)
+    if stream is None:
+        stream = _tts_streams[device] = torch.cuda.Stream(device=device)
+    return stream
+
+
+@contextlib.contextmanager
+def _tts_stream_context(model):
+    """
+    Inference mode plus the model's TTS CUDA stream; yields the stream (None off CUDA).
+
+    Grad mode is thread-local, so this must be entered on the TTS_EXECUTOR thread.
+    """
+    stream = _tts_stream(model)
+    with torch.inference_mode():
+        if stream is None:
+            yield None
+        else:
+            with torch.cuda.stream(stream):
+                yield stream
+
+
+@functools.lru_cache(maxsize=32)
+def _voice_conditionals(model, audio_prompt_path: str, mtime: float):
+    """Encode a voice prompt once per (path, mtime); generate() adjusts exaggeration itself"""
+    model.prepare_conditionals(audio_prompt_path)
+    return model.conds
+
+
+def _prepare_voice_on_stream(model, audio_prompt_path):
+    """
+    Encode (or fetch the cached) voice conditionals on the TTS stream and return them.
+
+    Runs once per request, so the prompt file is only read here; returns None
+    if the model has no prepare_conditionals API.
+    """
+    if not hasattr(model, 'prepare_conditionals'):
+        return None
+    with _tts_stream_context(model):
+        return _voice_conditionals(model, audio_prompt_path, os.path.getmtime(audio_prompt_path))
+
+
+def _discard_future(future: asyncio.Future) -> None:
+    """
+    Let go of an executor future that may never be awaited.
+
+    Cancels it if not started, else marks its error retrieved so asyncio doesn't log it.
+    """
+    if not future.cancel() and not future.cancelled():
+        future.exception()
+
+
+def _generate_on_stream(model, text, conds, audio_prompt_path, exaggeration, cfg_weight, temperature):
+    """Run model.generate on the TTS stream with the request's conditionals. Meant to be called on TTS_EXECUTOR."""
+    with _tts_stream_context(model) as stream:
+        if conds is not None:
+            # Set per chunk: other requests may have swapped model.conds in between
+            model.conds = conds
+            audio_prompt_path = None
+        audio_tensor = model.generate(
+            text=text,
+            audio_prompt_path=audio_prompt_path,
+            exaggeration=exaggeration,
+            cfg_weight=cfg_weight,
+            temperature=temperature
+        )
+    if stream is not None:
+        stream.synchronize()
+    return audio_tensor
+
+
+def _pcm_to_numpy(audio_tensor) -> np.ndarray:
+    """
+    Get float32 samples of a generated chunk as a [1, samples] numpy array.
+
+    The stream is mono (the WAV header says so), so any output layout is
+    flattened to one row instead of guessing which axis holds the channels.
+    ChatterboxTTS.generate returns CPU tensors, which are viewed in place.
+    """
+    if not isinstance(audio_tensor, torch.Tensor):
+        return np.asarray(audio_tensor, dtype=np.float32).reshape(1, -1)
+    return audio_tensor.detach().reshape(1, -1).cpu().float().contiguous().numpy()
+
+
+# Canonical 44-byte RIFF/WAVE header: preamble, 16-byte fmt chunk, data chunk id
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+# RIFF/data size placeholder for streams whose length is not known in advance
+_WAV_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+@functools.lru_cache(maxsize=8)
+def _wav_header(sample_rate: int, channels: int = 1, bits: int = 16, fmt: int = 1) -> bytes:
+    """
+    Build a streaming WAV header (fmt 1 = integer PCM, 3 = IEEE float).
+
+    Sizes are always the unknown-length sentinel, so the header depends only
+    on the format; it is packed once per format and the same bytes object is
+    sent by every streaming request.
+    """
+    block_align = channels * bits // 8
+    return _WAV_HEADER.pack(
+        b"RIFF", _WAV_UNKNOWN_SIZE, b"WAVE",
+        b"fmt ", 16, fmt, channels, sample_rate, sample_rate * block_align, block_align, bits,
+        b"data", _WAV_UNKNOWN_SIZE
+    )
+
+
+if numba is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def _crossfade_kernel(prev_tail, next_head, fade_in, out):
+        for c in range(out.shape[0]):
+            for i in range(out.shape[1]):
+                out[c, i] = prev_tail[c, i] + (next_head[c, i] - prev_tail[c, i]) * fade_in[i]
+
+    @numba.njit(fastmath=True, cache=True)
+    def _pcm16_kernel(pcm, out):
+        for c in range(out.shape[0]):
+            for i in range(out.shape[1]):
+                out[c, i] = np.int16(min(max(pcm[c, i], -1.0), 1.0) * 32767.0)
+
+    # Compile at import so the first request doesn't pay for it. Argument types
+    # must match the runtime ones exactly: the fade ramp from _fade_in_curve is
+    # read-only, which numba compiles as a separate signature.
+    _warmup_ramp = np.zeros(1, np.float32)
+    _warmup_ramp.flags.writeable = False
+    _crossfade_kernel(np.zeros((1, 1), np.float32), np.zeros((1, 1), np.float32),
+                      _warmup_ramp, np.empty((1, 1), np.float32))
+    del _warmup_ramp
+    _pcm16_kernel(np.zeros((1, 1), np.float32), np.empty((1, 1), np.int16))
+
+
+def _to_pcm16(parts: List[np.ndarray], scratch: np.ndarray) -> Tuple[bytes, np.ndarray]:
+    """
+    Clip float PCM to [-1, 1] and quantize it to little-endian int16 bytes.
+
+    `parts` are [1, samples] arrays written back to back into a reusable int16
+    scratch buffer (grown geometrically), so a crossfaded seam and the chunk
+    body after it leave as one buffer with a single tobytes() allocation.
+    With numba each part is a single fused pass; the NumPy fallback clips the
+    parts in place first. Returns (pcm_bytes, scratch).
+    """
+    total = sum(pcm.shape[1] for pcm in parts)
+    if scratch.size < total:
+        scratch = np.empty(max(total, 2 * scratch.size), dtype=np.int16)
+    offset = 0
+    for pcm in parts:
+        out = scratch[offset:offset + pcm.shape[1]].reshape(pcm.shape)
+        if numba is not None:
+            _pcm16_kernel(pcm, out)
+        else:
+            np.clip(pcm, -1, 1, out=pcm)
+            np.multiply(pcm, 32767.0, out=out, casting='unsafe')
+        offset += pcm.shape[1]
+    return scratch[:total].tobytes(), scratch
+
+
+@functools.lru_cache(maxsize=8)
+def _fade_in_curve(fade_samples: int, dtype: np.dtype) -> np.ndarray:
+    """Linear 0 -> 1 fade-in ramp, computed once per (length, dtype)"""
+    curve = np.linspace(0, 1, fade_samples, endpoint=False, dtype=dtype)
+    curve.flags.writeable = False  # shared between requests
+    return curve
+
 
 def crossfade_pcm(prev_pcm, next_pcm, fade_samples):
     """
@@ -40,15 +292,105 @@ def crossfade_pcm(prev_pcm, next_pcm, fade_samples):
     if prev_pcm is None or prev_pcm.shape[1] < fade_samples or next_pcm.shape[1] < fade_samples:
         # Not enough to crossfade, just return next_pcm unchanged
         return None, next_pcm
-    # Crossfade region
-    fade_out = np.linspace(1, 0, fade_samples, endpoint=False, dtype=prev_pcm.dtype)
-    fade_in = np.linspace(0, 1, fade_samples, endpoint=False, dtype=prev_pcm.dtype)
-    blended = prev_pcm[:, -fade_samples:] * fade_out + next_pcm[:, :fade_samples] * fade_in
+    # Crossfade region: prev*fade_out + next*fade_in == prev + (next - prev)*fade_in,
+    # computed in a single output buffer
+    fade_in = _fade_in_curve(fade_samples, prev_pcm.dtype)
+    prev_tail = prev_pcm[:, -fade_samples:]
+    next_head = next_pcm[:, :fade_samples]
+    if numba is not None:
+        blended = np.empty(prev_tail.shape, dtype=prev_pcm.dtype)
+        _crossfade_kernel(prev_tail, next_head, fade_in, blended)
+    else:
+        blended = np.subtract(next_head, prev_tail)
+        np.multiply(blended, fade_in, out=blended)
+        np.add(blended, prev_tail, out=blended)
     # Concatenate: (no crossfade for first chunk, so return only the rest)
     next_trimmed = next_pcm[:, fade_samples:]
     return blended, next_trimmed
 
 
+class _CrossfadeStream:
+    """
+    Crossfade consecutive PCM chunks of one stream and quantize them to int16 bytes.
+
+    The last fade_samples of each chunk are held back to blend into the next
+    one, so flush() must be called after the last chunk.
+    """
+
+    def __init__(self, fade_samples: int):
+        self.fade_samples = fade_samples
+        self._tail = None
+        self._scratch = np.empty(0, dtype=np.int16)  # int16 output buffer, reused across chunks
+
+    def feed(self, np_pcm: np.ndarray) -> bytes:
+        """Add a [1, samples] float chunk and return the PCM bytes ready to send"""
+        # Crossfading stays in float32; only the emitted samples are clipped
+        # and quantized to int16
+        parts = []
+        if self._tail is not None:
+            # Crossfade the held-back tail of the previous chunk into this one
+            cross, np_pcm = crossfade_pcm(self._tail, np_pcm, self.fade_samples)
+            # A chunk too short to blend into gets the tail as-is
+            parts.append(self._tail if cross is None else cross)
+
+        # Hold back the last fade_samples for the next crossfade; copy them so
+        # the rest of this chunk's samples can be freed
+        if np_pcm.shape[1] > self.fade_samples:
+            body = np_pcm[:, :-self.fade_samples]
+            self._tail = np_pcm[:, -self.fade_samples:].copy()
+        else:
+            body = np_pcm
+            self._tail = None
+        if body.size:
+            parts.append(body)
+        if not parts:
+            return b""
+        # Seam and body go out as one contiguous block
+        pcm_bytes, self._scratch = _to_pcm16(parts, self._scratch)
+        return pcm_bytes
+
+    def flush(self) -> bytes:
+        """Return the held-back tail of the last chunk, which has nothing to fade into"""
+        if self._tail is None:
+            return b""
+        pcm_bytes, self._scratch = _to_pcm16([self._tail], self._scratch)
+        self._tail = None
+        return pcm_bytes
+
+
+class _ChunkProgress:
+    """
+    Rate-limited per-chunk GENERATING_AUDIO status updates for one request.
+
+    The first and last chunks are always reported; in between, updates that
+    come sooner than STATUS_UPDATE_INTERVAL after the previous one are dropped.
+    """
+
+    def __init__(self, request_id: str, total_chunks: int):
+        self.request_id = request_id
+        self.total_chunks = total_chunks
+        self._last_update = 0.0
+
+    def update(self, i: int) -> None:
+        now = time.monotonic()
+        if 0 < i < self.total_chunks - 1 and now - self._last_update < STATUS_UPDATE_INTERVAL:
+            return
+        self._last_update = now
+        update_tts_status(self.request_id, TTSStatus.GENERATING_AUDIO,
+                        f"Generating audio for chunk {i+1}/{self.total_chunks}",
+                        current_chunk=i+1, total_chunks=self.total_chunks)
+
+
+# OpenAI voice names that map to the default voice when they have no alias
+_OPENAI_VOICES = frozenset({"alloy", "echo", "fable", "onyx", "nova", "shimmer"})
+
+
+@functools.lru_cache(maxsize=256)
+def _lookup_voice_path(voice_name: str, library_generation: int) -> Optional[str]:
+    """Voice library lookup (names and aliases), cached until the library changes"""
+    return get_voice_library().get_voice_path(voice_name)
+
+
 def resolve_voice_path(voice_name: Optional[str]) -> str:
     """
     Resolve a voice name or alias to a file path.
@@ -65,12 +407,15 @@ def resolve_voice_path(voice_name: Optional[str]) -> str:
     
     # Try to resolve from voice library (handles both names and aliases)
     voice_lib = get_voice_library()
-    voice_path = voice_lib.get_voice_path(voice_name)
+    voice_path = _lookup_voice_path(voice_name, voice_lib.generation)
+    if voice_path is not None and not os.path.exists(voice_path):
+        # File went missing after the lookup was cached; the uncached lookup
+        # drops it from the library
+        voice_path = voice_lib.get_voice_path(voice_name)
     
     if voice_path is None:
         # Check if it's an OpenAI voice name without an alias mapping
-        openai_voices = {"alloy", "echo", "fable", "onyx", "nova", "shimmer"}
-        if voice_name.lower() in openai_voices:
+        if voice_name.lower() in _OPENAI_VOICES:
             print(f"🎵 Using default voice for OpenAI voice '{voice_name}' (no alias mapping)")
             return Config.VOICE_SAMPLE_PATH
         
@@ -81,41 +426,163 @@ def resolve_voice_path(voice_name: Optional[str]) -> str:
     return voice_path
 
 
-def validate_audio_file(file: UploadFile) -> None:
-    """Validate uploaded audio file"""
+def validate_audio_file(file: UploadFile) -> str:
+    """Validate uploaded audio file and return its lowercased extension"""
     if not file.filename:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": {"message": "No filename provided", "type": "invalid_request_error"}}
+            detail=_ERR_NO_FILENAME
         )
     
     # Check file extension
-    file_ext = os.path.splitext(file.filename.lower())[1]
+    file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in SUPPORTED_AUDIO_FORMATS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
                 "error": {
-                    "message": f"Unsupported audio format: {file_ext}. Supported formats: {', '.join(SUPPORTED_AUDIO_FORMATS)}",
+                    "message": f"Unsupported audio format: {file_ext}. Supported formats: {', '.join(sorted(SUPPORTED_AUDIO_FORMATS))}",
                     "type": "invalid_request_error"
                 }
             }
         )
     
-    # Check file size (max 10MB)
-    max_size = 25 * 1024 * 1024  # 10MB
-    if hasattr(file, 'size') and file.size and file.size > max_size:
+    # Check file size when the client declared it; hash_voice_upload enforces
+    # the same limit while reading
+    if hasattr(file, 'size') and file.size and file.size > MAX_VOICE_FILE_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=_ERR_VOICE_FILE_TOO_LARGE
+        )
+    
+    return file_ext
+
+
+def _looks_like_audio(head: bytes) -> bool:
+    """Check the leading bytes of an upload against the supported container signatures"""
+    return (
+        (head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE")
+        or head[:4] in (b"fLaC", b"OggS")
+        or head[:3] == b"ID3"
+        or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)  # bare MPEG frame sync
+        or head[4:8] == b"ftyp"  # MP4/M4A
+    )
+
+
+async def hash_voice_upload(voice_file: UploadFile) -> Tuple[int, str]:
+    """
+    Fingerprint an uploaded voice file without copying it anywhere.
+
+    Reads one UPLOAD_CHUNK_SIZE block at a time, hashing in the default
+    executor. Content that isn't a known audio container is rejected on the
+    first block, oversize uploads as soon as they cross the limit. Rewinds
+    the upload afterwards so it can still be saved. Returns the size in bytes
+    and the hex digest of the content.
+    """
+    loop = asyncio.get_running_loop()
+    hasher = hashlib.blake2b(digest_size=16)
+    total = 0
+    while chunk := await voice_file.read(UPLOAD_CHUNK_SIZE):
+        if not total and not _looks_like_audio(chunk):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=_ERR_NOT_AUDIO)
+        total += len(chunk)
+        if total > MAX_VOICE_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=_ERR_VOICE_FILE_TOO_LARGE
+            )
+        await loop.run_in_executor(None, hasher.update, chunk)
+    if not total:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=_ERR_NOT_AUDIO)
+    await voice_file.seek(0)
+    return total, hasher.hexdigest()
+
+
+async def save_voice_upload(voice_file: UploadFile, temp_voice_fd: int) -> None:
+    """
+    Copy an uploaded voice file into an open temp file, one block at a time.
+
+    Blocking writes run in the default executor so the event loop keeps
+    serving other requests, and peak memory stays at one UPLOAD_CHUNK_SIZE
+    block. Takes ownership of the descriptor.
+    """
+    loop = asyncio.get_running_loop()
+    with os.fdopen(temp_voice_fd, 'wb') as temp_file:
+        while chunk := await voice_file.read(UPLOAD_CHUNK_SIZE):
+            await loop.run_in_executor(None, temp_file.write, chunk)
+
+
+async def _store_uploaded_voice(voice_file: UploadFile) -> Tuple[str, Optional[str]]:
+    """
+    Validate an uploaded voice sample and save it where the model can read it.
+
+    A sample already in the upload store is reused as-is; otherwise the upload
+    is staged and moved into the store, or copied to a per-request temp file
+    when the store can't hold it. Returns the path to generate with and that
+    temp file (None for stored samples, which stay pinned); hand both to
+    _release_uploaded_voice once generation is done.
+    Validation errors are raised as they are, anything else as a 500.
+    """
+    temp_voice_path = None
+    try:
+        file_ext = validate_audio_file(voice_file)
+        file_size, digest = await hash_voice_upload(voice_file)
+        cacheable = voice_upload_cacheable(file_size)
+        voice_sample_path = find_voice_upload(digest, file_ext) if cacheable else None
+        
+        if voice_sample_path is None:
+            # Create temporary file for the voice sample and copy the upload in blocks
+            temp_voice_fd, temp_voice_path = voice_upload_tempfile(file_ext, cacheable)
+            await save_voice_upload(voice_file, temp_voice_fd)
+            
+            if cacheable:
+                # Moved into the upload store; no longer a temp file to clean up
+                voice_sample_path = store_voice_upload(temp_voice_path, digest, file_ext, file_size)
+                temp_voice_path = None
+            else:
+                voice_sample_path = temp_voice_path
+        logger.info("Using uploaded voice file: %s (%d bytes)", voice_file.filename, file_size)
+        return voice_sample_path, temp_voice_path
+        
+    except Exception as e:
+        # Clean up temp file if it was created
+        if temp_voice_path:
+            with contextlib.suppress(FileNotFoundError, PermissionError):
+                os.unlink(temp_voice_path)
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
                 "error": {
-                    "message": f"File too large. Maximum size: {max_size // (1024*1024)}MB",
-                    "type": "invalid_request_error"
+                    "message": f"Failed to process voice file: {str(e)}",
+                    "type": "file_processing_error"
                 }
             }
         )
 
 
+def _release_uploaded_voice(voice_sample_path: str, temp_voice_path: Optional[str]) -> None:
+    """Delete the per-request copy of an uploaded sample, or unpin the stored one"""
+    if temp_voice_path:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_voice_path)
+    else:
+        release_voice_upload(voice_sample_path)
+
+
+async def _release_after(
+    stream: AsyncGenerator[bytes, None], voice_sample_path: str, temp_voice_path: Optional[str]
+) -> AsyncGenerator[bytes, None]:
+    """Pass a stream through, releasing its uploaded voice sample once it is closed"""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        await stream.aclose()
+        _release_uploaded_voice(voice_sample_path, temp_voice_path)
+
+
 async def generate_speech_internal(
     text: str,
     voice_sample_path: str,
@@ -147,7 +614,7 @@ async def generate_speech_internal(
         update_tts_status(request_id, TTSStatus.ERROR, error_message="Model not loaded")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": {"message": "Model not loaded", "type": "model_error"}}
+            detail=_ERR_MODEL_NOT_LOADED
         )
 
     # Log memory usage before processing
@@ -157,7 +624,7 @@ async def generate_speech_internal(
         update_tts_status(request_id, TTSStatus.INITIALIZING, "Monitoring initial memory", 
                         memory_usage=initial_memory)
         print(f"📊 Request #{REQUEST_COUNTER} - Initial memory: CPU {initial_memory['cpu_memory_mb']:.1f}MB", end="")
-        if torch.cuda.is_available():
+        if HAS_CUDA:
             print(f", GPU {initial_memory['gpu_memory_allocated_mb']:.1f}MB allocated")
         else:
             print()
@@ -169,17 +636,13 @@ async def generate_speech_internal(
                         error_message=f"Input text too long. Maximum {Config.MAX_TOTAL_LENGTH} characters allowed.")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": {
-                    "message": f"Input text too long. Maximum {Config.MAX_TOTAL_LENGTH} characters allowed.",
-                    "type": "invalid_request_error"
-                }
-            }
+            detail=_ERR_TEXT_TOO_LONG
         )
 
     audio_chunks = []
     final_audio = None
     buffer = None
+    voice_ready = None
     
     try:
         # Get parameters with defaults
@@ -187,6 +650,10 @@ async def generate_speech_internal(
         cfg_weight = cfg_weight if cfg_weight is not None else Config.CFG_WEIGHT
         temperature = temperature if temperature is not None else Config.TEMPERATURE
         
+        # Start encoding the voice prompt before chunking the text
+        loop = asyncio.get_running_loop()
+        voice_ready = loop.run_in_executor(TTS_EXECUTOR, _prepare_voice_on_stream, model, voice_sample_path)
+        
         # Split text into chunks
         update_tts_status(request_id, TTSStatus.CHUNKING, "Splitting text into chunks")
         chunks = split_text_into_chunks(text, Config.MAX_CHUNK_LENGTH)
@@ -201,49 +668,36 @@ async def generate_speech_internal(
         update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, "Starting audio generation", 
                         current_chunk=0, total_chunks=len(chunks))
         
-        # Generate audio for each chunk with memory management
-        loop = asyncio.get_event_loop()
+        # Generate audio chunk by chunk. Each chunk is its own TTS_EXECUTOR job,
+        # so other requests (streaming ones in particular) interleave after at
+        # most one chunk instead of waiting for this whole text.
+        progress = _ChunkProgress(request_id, len(chunks))
         
+        # The voice prompt must be encoded first (this also surfaces a bad prompt file);
+        # every chunk then reuses the same conditionals without touching the file
+        conds = await voice_ready
         for i, chunk in enumerate(chunks):
-            # Update progress
-            current_step = f"Generating audio for chunk {i+1}/{len(chunks)}"
-            update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, current_step, 
-                            current_chunk=i+1, total_chunks=len(chunks))
+            progress.update(i)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Generating audio for chunk %d/%d: '%s%s'",
+                            i+1, len(chunks), chunk[:50], '...' if len(chunk) > 50 else '')
             
-            print(f"Generating audio for chunk {i+1}/{len(chunks)}: '{chunk[:50]}{'...' if len(chunk) > 50 else ''}'")
-            
-            # Use torch.no_grad() to prevent gradient accumulation
-            with torch.no_grad():
-                # Run TTS generation in executor to avoid blocking
-                audio_tensor = await loop.run_in_executor(
-                    None,
-                    lambda: model.generate(
-                        text=chunk,
-                        audio_prompt_path=voice_sample_path,
-                        exaggeration=exaggeration,
-                        cfg_weight=cfg_weight,
-                        temperature=temperature
-                    )
-                )
-                
-                # Ensure tensor is on the correct device and detached
-                if hasattr(audio_tensor, 'detach'):
-                    audio_tensor = audio_tensor.detach()
-                
-                audio_chunks.append(audio_tensor)
+            # Run TTS generation in executor to avoid blocking
+            audio_tensor = await loop.run_in_executor(
+                TTS_EXECUTOR, _generate_on_stream,
+                model, chunk, conds, voice_sample_path, exaggeration, cfg_weight, temperature
+            )
             
-            # Periodic memory cleanup during generation
-            if i > 0 and i % 3 == 0:  # Every 3 chunks
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+            # Ensure tensor is detached
+            if hasattr(audio_tensor, 'detach'):
+                audio_tensor = audio_tensor.detach()
+            audio_chunks.append(audio_tensor)
         
         # Concatenate all chunks with memory management
         if len(audio_chunks) > 1:
             update_tts_status(request_id, TTSStatus.CONCATENATING, "Concatenating audio chunks")
             print("Concatenating audio chunks...")
-            with torch.no_grad():
+            with torch.inference_mode():
                 final_audio = concatenate_audio_chunks(audio_chunks, model.sr)
         else:
             final_audio = audio_chunks[0]
@@ -282,6 +736,10 @@ async def generate_speech_internal(
         )
     
     finally:
+        # Chunking or generation may have failed before the voice prep was awaited
+        if voice_ready is not None:
+            _discard_future(voice_ready)
+        
         # Comprehensive cleanup
         try:
             # Clean up all audio chunks
@@ -305,7 +763,7 @@ async def generate_speech_internal(
             if Config.ENABLE_MEMORY_MONITORING:
                 final_memory = get_memory_info()
                 print(f"📊 Request #{REQUEST_COUNTER} - Final memory: CPU {final_memory['cpu_memory_mb']:.1f}MB", end="")
-                if torch.cuda.is_available():
+                if HAS_CUDA:
                     print(f", GPU {final_memory['gpu_memory_allocated_mb']:.1f}MB allocated")
                 else:
                     print()
@@ -314,7 +772,7 @@ async def generate_speech_internal(
                 if 'initial_memory' in locals():
                     cpu_diff = final_memory['cpu_memory_mb'] - initial_memory['cpu_memory_mb']
                     print(f"📈 Memory change: CPU {cpu_diff:+.1f}MB", end="")
-                    if torch.cuda.is_available():
+                    if HAS_CUDA:
                         gpu_diff = final_memory['gpu_memory_allocated_mb'] - initial_memory['gpu_memory_allocated_mb']
                         print(f", GPU {gpu_diff:+.1f}MB")
                     else:
@@ -362,7 +820,7 @@ async def generate_speech_streaming(
         update_tts_status(request_id, TTSStatus.ERROR, error_message="Model not loaded")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"error": {"message": "Model not loaded", "type": "model_error"}}
+            detail=_ERR_MODEL_NOT_LOADED
         )
 
     # Log memory usage before processing
@@ -372,7 +830,7 @@ async def generate_speech_streaming(
         update_tts_status(request_id, TTSStatus.INITIALIZING, "Monitoring initial memory (streaming)", 
                         memory_usage=initial_memory)
         print(f"📊 Streaming Request #{REQUEST_COUNTER} - Initial memory: CPU {initial_memory['cpu_memory_mb']:.1f}MB", end="")
-        if torch.cuda.is_available():
+        if HAS_CUDA:
             print(f", GPU {initial_memory['gpu_memory_allocated_mb']:.1f}MB allocated")
         else:
             print()
@@ -384,18 +842,14 @@ async def generate_speech_streaming(
                         error_message=f"Input text too long. Maximum {Config.MAX_TOTAL_LENGTH} characters allowed.")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": {
-                    "message": f"Input text too long. Maximum {Config.MAX_TOTAL_LENGTH} characters allowed.",
-                    "type": "invalid_request_error"
-                }
-            }
+            detail=_ERR_TEXT_TOO_LONG
         )
 
     # WAV header info for streaming
     sample_rate = model.sr
     channels = 1
-    bits_per_sample = 32
+    bits_per_sample = 16  # int16 PCM: half the bytes of float32 on the wire
+    voice_ready = None
     
     # Generate and yield WAV header first
     try:
@@ -409,6 +863,10 @@ async def generate_speech_streaming(
             streaming_chunk_size, streaming_strategy, streaming_quality
         )
         
+        # Start encoding the voice prompt before chunking the text
+        loop = asyncio.get_running_loop()
+        voice_ready = loop.run_in_executor(TTS_EXECUTOR, _prepare_voice_on_stream, model, voice_sample_path)
+        
         # Split text using streaming-optimized chunking
         update_tts_status(request_id, TTSStatus.CHUNKING, "Splitting text for streaming")
         chunks = split_text_for_streaming(
@@ -431,74 +889,64 @@ async def generate_speech_streaming(
         update_tts_status(request_id, TTSStatus.GENERATING_AUDIO, "Starting streaming audio generation", 
                         current_chunk=0, total_chunks=len(chunks))
         
-        # We'll write a temporary WAV header and update it later with correct size
-        # For streaming, we start with a placeholder header
-        header_buffer = io.BytesIO()
-        temp_audio = torch.zeros(1, sample_rate)  # 1 second of silence as placeholder
-        ta.save(header_buffer, temp_audio, sample_rate, format="wav")
-        header_data = header_buffer.getvalue()
-        
-        # Extract just the WAV header (first 44 bytes typically)
-        wav_header = header_data[:44]
-        yield wav_header
+        # Sizes are unknown up front, so the header carries the streaming
+        # sentinel instead of real RIFF/data lengths
+        yield _wav_header(sample_rate, channels, bits_per_sample)
         
         # Generate and stream audio for each chunk
-        loop = asyncio.get_event_loop()
         total_samples = 0
         
-        prev_pcm = None
         fade_ms = 10  # Crossfade duration
-        fade_samples = int(sample_rate * fade_ms / 1000)
+        pcm_stream = _CrossfadeStream(int(sample_rate * fade_ms / 1000))
 
-        for i, chunk in enumerate(chunks):
-            ...
-            with torch.no_grad():
-                audio_tensor = await loop.run_in_executor(
-                    None,
-                    lambda: model.generate(
-                        text=chunk,
-                        audio_prompt_path=voice_sample_path,
-                        exaggeration=exaggeration,
-                        cfg_weight=cfg_weight,
-                        temperature=temperature
+        # Generation runs in a producer task one chunk ahead of the consumer
+        # below, so the model works on chunk i+1 while chunk i is converted,
+        # crossfaded and flushed to the client. The bounded queue caps how far
+        # ahead it can get.
+        audio_queue = asyncio.Queue(maxsize=2)
+
+        progress = _ChunkProgress(request_id, len(chunks))
+
+        async def produce_audio():
+            try:
+                conds = await voice_ready
+                for i, chunk in enumerate(chunks):
+                    progress.update(i)
+                    audio_tensor = await loop.run_in_executor(
+                        TTS_EXECUTOR, _generate_on_stream,
+                        model, chunk, conds, voice_sample_path, exaggeration, cfg_weight, temperature
                     )
-                )
-                if hasattr(audio_tensor, 'cpu'):
-                    audio_tensor = audio_tensor.cpu()
-                np_pcm = audio_tensor.numpy() if hasattr(audio_tensor, 'numpy') else np.array(audio_tensor)
-                # Transpose if shape is [samples, channels]
-                if np_pcm.shape[0] < np_pcm.shape[-1]:  # likely shape [samples, channels]
-                    np_pcm = np_pcm.T
-                # Debug:
-                print(f"Chunk {i}: np_pcm shape {np_pcm.shape}, min {np_pcm.min()}, max {np_pcm.max()}")
-                # For first chunk, yield whole chunk except last fade_samples
-                if prev_pcm is None:
-                    chunk_to_stream = np_pcm[:, :-fade_samples] if np_pcm.shape[1] > fade_samples else np_pcm
-                    audio_bytes = np.clip(chunk_to_stream, -1, 1).astype(np.float32).tobytes()
-                    yield audio_bytes
+                    await audio_queue.put(audio_tensor)
+            except Exception:
+                # Wake the consumer; it re-raises the error by awaiting the task
+                await audio_queue.put(None)
+                raise
+            await audio_queue.put(None)
 
-                else:
-                    # Crossfade with previous chunk
-                    cross, np_pcm_trimmed = crossfade_pcm(prev_pcm, np_pcm, fade_samples)
-                    if cross is not None:
-                        cross_bytes = np.clip(cross, -1, 1).astype(np.float32).tobytes()
-                        yield cross_bytes
-
-                    chunk_to_stream = np_pcm_trimmed[:, :-fade_samples] if np_pcm_trimmed.shape[1] > fade_samples else np_pcm_trimmed
-                    audio_bytes = np.clip(chunk_to_stream, -1, 1).astype(np.float32).tobytes()
+        producer = asyncio.create_task(produce_audio())
+        try:
+            i = 0
+            while (audio_tensor := await audio_queue.get()) is not None:
+                np_pcm = _pcm_to_numpy(audio_tensor)  # [1, samples]
+                # min/max scan the whole chunk, so only compute them when debugging
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Chunk %d: np_pcm shape %s, min %s, max %s",
+                                 i, np_pcm.shape, np_pcm.min(), np_pcm.max())
+                if audio_bytes := pcm_stream.feed(np_pcm):
                     yield audio_bytes
 
-                prev_pcm = np_pcm
                 safe_delete_tensors(audio_tensor)
-                del audio_tensor, np_pcm, chunk_to_stream, audio_bytes
-            
-            
-            # Periodic memory cleanup during generation
-            if i > 0 and i % 3 == 0:  # Every 3 chunks
-                import gc
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                del audio_tensor, np_pcm
+                i += 1
+
+            if tail_bytes := pcm_stream.flush():
+                yield tail_bytes
+
+            # Surface a generation error, if the producer stopped on one
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
         
         # Mark as completed
         update_tts_status(request_id, TTSStatus.COMPLETED, "Streaming audio generation completed")
@@ -519,6 +967,11 @@ async def generate_speech_streaming(
         )
     
     finally:
+        # Chunking may have failed, or the client left at the header, before
+        # the producer awaited the voice prep
+        if voice_ready is not None:
+            _discard_future(voice_ready)
+        
         # Periodic memory cleanup
         if REQUEST_COUNTER % Config.MEMORY_CLEANUP_INTERVAL == 0:
             cleanup_memory()
@@ -527,15 +980,44 @@ async def generate_speech_streaming(
         if Config.ENABLE_MEMORY_MONITORING:
             final_memory = get_memory_info()
             print(f"📊 Streaming Request #{REQUEST_COUNTER} - Final memory: CPU {final_memory['cpu_memory_mb']:.1f}MB", end="")
-            if torch.cuda.is_available():
+            if HAS_CUDA:
                 print(f", GPU {final_memory['gpu_memory_allocated_mb']:.1f}MB allocated")
             else:
                 print()
 
 
+async def buffered_stream(source: AsyncGenerator[bytes, None], max_buffer_size: int = 4) -> AsyncGenerator[bytes, None]:
+    """
+    Relay an audio generator through a bounded memory stream, running it up to `max_buffer_size` chunks ahead.
+
+    `source` is closed before aclose() returns, so its cleanup has run by then.
+    """
+    send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size)
+
+    async def pump():
+        try:
+            async with send_stream:
+                async for chunk in source:
+                    await send_stream.send(chunk)
+        finally:
+            await source.aclose()
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        async with receive_stream:
+            async for chunk in receive_stream:
+                yield chunk
+        # Surface an error that ended the source early
+        await pump_task
+    finally:
+        if not pump_task.done():
+            pump_task.cancel()
+            await asyncio.wait([pump_task])
+
+
 @router.post(
     "/audio/speech",
-    response_class=StreamingResponse,
+    response_class=Response,
     responses={
         200: {"content": {"audio/wav": {}}},
         400: {"model": ErrorResponse},
@@ -560,9 +1042,9 @@ async def text_to_speech(request: TTSRequest):
         temperature=request.temperature
     )
     
-    # Create response
-    response = StreamingResponse(
-        io.BytesIO(buffer.getvalue()),
+    # Create response; the WAV is already complete, so send it in one body
+    response = Response(
+        content=buffer.getvalue(),
         media_type="audio/wav",
         headers={"Content-Disposition": "attachment; filename=speech.wav"}
     )
@@ -572,10 +1054,11 @@ async def text_to_speech(request: TTSRequest):
 
 @router.post(
     "/audio/speech/upload",
-    response_class=StreamingResponse,
+    response_class=Response,
     responses={
         200: {"content": {"audio/wav": {}}},
         400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
         500: {"model": ErrorResponse}
     },
     summary="Generate speech with custom voice upload or library selection",
@@ -597,55 +1080,16 @@ async def text_to_speech_with_upload(
     if not input or not input.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": {"message": "Input text cannot be empty", "type": "invalid_request_error"}}
+            detail=_ERR_EMPTY_INPUT
         )
     
     input = input.strip()
     
-    # Handle voice selection and file upload
-    temp_voice_path = None
-    voice_sample_path = Config.VOICE_SAMPLE_PATH  # Default
-    
-    # First, try to resolve voice name from library if no file uploaded
-    if not voice_file:
-        voice_sample_path = resolve_voice_path(voice)
-    
-    # If a file is uploaded, it takes priority over voice name
+    # An uploaded file takes priority over the voice name
     if voice_file:
-        try:
-            # Validate the uploaded file
-            validate_audio_file(voice_file)
-            
-            # Create temporary file for the voice sample
-            file_ext = os.path.splitext(voice_file.filename.lower())[1]
-            temp_voice_fd, temp_voice_path = tempfile.mkstemp(suffix=file_ext, prefix="voice_sample_")
-            
-            # Read and save the uploaded file
-            file_content = await voice_file.read()
-            with os.fdopen(temp_voice_fd, 'wb') as temp_file:
-                temp_file.write(file_content)
-            
-            voice_sample_path = temp_voice_path
-            print(f"Using uploaded voice file: {voice_file.filename} ({len(file_content):,} bytes)")
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            # Clean up temp file if it was created
-            if temp_voice_path and os.path.exists(temp_voice_path):
-                try:
-                    os.unlink(temp_voice_path)
-                except:
-                    pass
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={
-                    "error": {
-                        "message": f"Failed to process voice file: {str(e)}",
-                        "type": "file_processing_error"
-                    }
-                }
-            )
+        voice_sample_path, temp_voice_path = await _store_uploaded_voice(voice_file)
+    else:
+        voice_sample_path = resolve_voice_path(voice)
     
     try:
         # Generate speech using internal function
@@ -656,24 +1100,18 @@ async def text_to_speech_with_upload(
             cfg_weight=cfg_weight,
             temperature=temperature
         )
-        
-        # Create response
-        response = StreamingResponse(
-            io.BytesIO(buffer.getvalue()),
-            media_type="audio/wav",
-            headers={"Content-Disposition": "attachment; filename=speech.wav"}
-        )
-        
-        return response
-        
     finally:
-        # Clean up temporary voice file
-        if temp_voice_path and os.path.exists(temp_voice_path):
-            try:
-                os.unlink(temp_voice_path)
-                print(f"🗑️ Cleaned up temporary voice file: {temp_voice_path}")
-            except Exception as e:
-                print(f"⚠️ Warning: Failed to clean up temporary voice file: {e}")
+        if voice_file:
+            _release_uploaded_voice(voice_sample_path, temp_voice_path)
+    
+    # Create response; the WAV is already complete, so send it in one body
+    response = Response(
+        content=buffer.getvalue(),
+        media_type="audio/wav",
+        headers={"Content-Disposition": "attachment; filename=speech.wav"}
+    )
+    
+    return response
 
 
 @router.post(
@@ -694,9 +1132,9 @@ async def stream_text_to_speech(request: TTSRequest):
     # Resolve voice name to file path
     voice_sample_path = resolve_voice_path(request.voice)
     
-    # Create streaming response
+    # Create streaming response; generation runs ahead of slow clients by a few chunks
     return StreamingResponse(
-        generate_speech_streaming(
+        buffered_stream(generate_speech_streaming(
             text=request.input,
             voice_sample_path=voice_sample_path,
             exaggeration=request.exaggeration,
@@ -705,14 +1143,9 @@ async def stream_text_to_speech(request: TTSRequest):
             streaming_chunk_size=request.streaming_chunk_size,
             streaming_strategy=request.streaming_strategy,
             streaming_quality=request.streaming_quality
-        ),
+        )),
         media_type="audio/wav",
-        headers={
-            "Content-Disposition": "attachment; filename=speech_stream.wav",
-            "Transfer-Encoding": "chunked",
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"  # Disable nginx buffering for true streaming
-        }
+        headers=_STREAM_HEADERS
     )
 
 
@@ -722,6 +1155,7 @@ async def stream_text_to_speech(request: TTSRequest):
     responses={
         200: {"content": {"audio/wav": {}}},
         400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
         500: {"model": ErrorResponse}
     },
     summary="Stream speech generation with custom voice upload",
@@ -746,102 +1180,52 @@ async def stream_text_to_speech_with_upload(
     if not input or not input.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": {"message": "Input text cannot be empty", "type": "invalid_request_error"}}
+            detail=_ERR_EMPTY_INPUT
         )
     
     input = input.strip()
     
     # Validate streaming parameters
-    if streaming_strategy and streaming_strategy not in ['sentence', 'paragraph', 'fixed', 'word']:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": {"message": "streaming_strategy must be one of: sentence, paragraph, fixed, word", "type": "validation_error"}}
-        )
-    
-    if streaming_quality and streaming_quality not in ['fast', 'balanced', 'high']:
+    for name, value in (('streaming_strategy', streaming_strategy), ('streaming_quality', streaming_quality)):
+        allowed, error = _PARAM_ENUMS[name]
+        if value and value not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error
+            )
+
+    # Reject oversized text before any upload is read or stored
+    if len(input) > Config.MAX_TOTAL_LENGTH:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail={"error": {"message": "streaming_quality must be one of: fast, balanced, high", "type": "validation_error"}}
+            detail=_ERR_TEXT_TOO_LONG
         )
-    
-    # Handle voice selection and file upload
-    temp_voice_path = None
-    voice_sample_path = Config.VOICE_SAMPLE_PATH  # Default
-    
-    # First, try to resolve voice name from library if no file uploaded
-    if not voice_file:
+
+    # An uploaded file takes priority over the voice name; without one this is
+    # the same as /audio/speech/stream
+    if voice_file:
+        voice_sample_path, temp_voice_path = await _store_uploaded_voice(voice_file)
+    else:
         voice_sample_path = resolve_voice_path(voice)
     
-    # If a file is uploaded, it takes priority over voice name
+    stream = buffered_stream(generate_speech_streaming(
+        text=input,
+        voice_sample_path=voice_sample_path,
+        exaggeration=exaggeration,
+        cfg_weight=cfg_weight,
+        temperature=temperature,
+        streaming_chunk_size=streaming_chunk_size,
+        streaming_strategy=streaming_strategy,
+        streaming_quality=streaming_quality
+    ))
     if voice_file:
-        try:
-            # Validate the uploaded file
-            validate_audio_file(voice_file)
-            
-            # Create temporary file for the voice sample
-            file_ext = os.path.splitext(voice_file.filename.lower())[1]
-            temp_voice_fd, temp_voice_path = tempfile.mkstemp(suffix=file_ext, prefix="voice_sample_")
-            
-            # Read and save the uploaded file
-            file_content = await voice_file.read()
-            with os.fdopen(temp_voice_fd, 'wb') as temp_file:
-                temp_file.write(file_content)
-            
-            voice_sample_path = temp_voice_path
-            print(f"Using uploaded voice file for streaming: {voice_file.filename} ({len(file_content):,} bytes)")
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            # Clean up temp file if it was created
-            if temp_voice_path and os.path.exists(temp_voice_path):
-                try:
-                    os.unlink(temp_voice_path)
-                except:
-                    pass
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={
-                    "error": {
-                        "message": f"Failed to process voice file: {str(e)}",
-                        "type": "file_processing_error"
-                    }
-                }
-            )
-    
-    # Create async generator that handles cleanup
-    async def streaming_with_cleanup():
-        try:
-            async for chunk in generate_speech_streaming(
-                text=input,
-                voice_sample_path=voice_sample_path,
-                exaggeration=exaggeration,
-                cfg_weight=cfg_weight,
-                temperature=temperature,
-                streaming_chunk_size=streaming_chunk_size,
-                streaming_strategy=streaming_strategy,
-                streaming_quality=streaming_quality
-            ):
-                yield chunk
-        finally:
-            # Clean up temporary voice file
-            if temp_voice_path and os.path.exists(temp_voice_path):
-                try:
-                    os.unlink(temp_voice_path)
-                    print(f"🗑️ Cleaned up temporary voice file: {temp_voice_path}")
-                except Exception as e:
-                    print(f"⚠️ Warning: Failed to clean up temporary voice file: {e}")
+        stream = _release_after(stream, voice_sample_path, temp_voice_path)
     
     # Create streaming response
     return StreamingResponse(
-        streaming_with_cleanup(),
+        stream,
         media_type="audio/wav",
-        headers={
-            "Content-Disposition": "attachment; filename=speech_stream.wav",
-            "Transfer-Encoding": "chunked",
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no"  # Disable nginx buffering for true streaming
-        }
+        headers=_STREAM_HEADERS
     )
 
 # Export the base router for the main app to use
@@ -179,7 +179,7 @@ async def upload_voice(
         )
     
     # Check file extension
-    file_ext = os.path.splitext(voice_file.filename.lower())[1]
+    file_ext = os.path.splitext(voice_file.filename)[1].lower()
     if file_ext not in SUPPORTED_VOICE_FORMATS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -3,12 +3,18 @@ Configuration management for Chatterbox TTS API
 """
 
 import os
+import tempfile
 import torch
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Let the CUDA caching allocator grow segments in place instead of fragmenting,
+# so generation doesn't need empty_cache() between chunks. The allocator reads
+# this on first CUDA use, which happens after config is imported.
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True')
+
 
 class Config:
     """Application configuration class"""
@@ -34,6 +40,17 @@ class Config:
     # Voice library settings
     VOICE_LIBRARY_DIR = os.getenv('VOICE_LIBRARY_DIR', './voices')
     
+    # Scratch directory for uploaded voice samples (tmpfs when the host has one)
+    VOICE_TEMP_DIR = os.getenv(
+        'VOICE_TEMP_DIR',
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    )
+    
+    # On-disk store of uploaded voice samples, reused by content hash. Off by
+    # default (0 MB): enabling it keeps users' uploads on disk after their request
+    VOICE_UPLOAD_CACHE_DIR = os.getenv('VOICE_UPLOAD_CACHE_DIR', './voice_cache')
+    VOICE_UPLOAD_CACHE_MB = int(os.getenv('VOICE_UPLOAD_CACHE_MB', 0))
+    
     # Memory management settings
     MEMORY_CLEANUP_INTERVAL = int(os.getenv('MEMORY_CLEANUP_INTERVAL', 5))
     CUDA_CACHE_CLEAR_INTERVAL = int(os.getenv('CUDA_CACHE_CLEAR_INTERVAL', 3))
@@ -42,6 +59,9 @@ class Config:
     # CORS settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
     
+    # Logging level for application loggers (DEBUG, INFO, WARNING, ...)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    
     @classmethod
     def validate(cls):
         """Validate configuration values"""
@@ -59,6 +79,10 @@ class Config:
             raise ValueError(f"MEMORY_CLEANUP_INTERVAL must be positive, got {cls.MEMORY_CLEANUP_INTERVAL}")
         if cls.CUDA_CACHE_CLEAR_INTERVAL <= 0:
             raise ValueError(f"CUDA_CACHE_CLEAR_INTERVAL must be positive, got {cls.CUDA_CACHE_CLEAR_INTERVAL}")
+        if not os.path.isdir(cls.VOICE_TEMP_DIR):
+            raise ValueError(f"VOICE_TEMP_DIR must be an existing directory, got {cls.VOICE_TEMP_DIR}")
+        if cls.VOICE_UPLOAD_CACHE_MB < 0:
+            raise ValueError(f"VOICE_UPLOAD_CACHE_MB must be non-negative, got {cls.VOICE_UPLOAD_CACHE_MB}")
 
 
 def detect_device():
@@ -2,7 +2,6 @@
 Text processing utilities for TTS
 """
 
-import gc
 import torch
 import re
 from typing import List, Optional
@@ -363,15 +362,14 @@ def concatenate_audio_chunks(audio_chunks: list, sample_rate: int) -> torch.Tens
     
     # Use torch.no_grad() to prevent gradient tracking
     with torch.no_grad():
-        concatenated = audio_chunks[0]
-        
-        for i, chunk in enumerate(audio_chunks[1:], 1):
-            # Concatenate current result with silence and next chunk
-            concatenated = torch.cat([concatenated, silence, chunk], dim=1)
-            
-            # Optional: cleanup intermediate tensors for very long sequences
-            if i % 10 == 0:  # Every 10 chunks
-                gc.collect()
+        # Interleave chunks with silence and concatenate once: no intermediate
+        # tensors to copy (and collect) as the result grows
+        pieces = [audio_chunks[0]]
+        for chunk in audio_chunks[1:]:
+            pieces.append(silence)
+            pieces.append(chunk)
+        concatenated = torch.cat(pieces, dim=1)
+        del pieces
     
     # Clean up silence tensor
     del silence
@@ -77,7 +77,7 @@ async def initialize_model():
         
         _initialization_progress = "Loading TTS model (this may take a while)..."
         # Initialize model with run_in_executor for non-blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         _model = await loop.run_in_executor(
             None, 
             lambda: ChatterboxTTS.from_pretrained(device=_device)
@@ -24,6 +24,8 @@ class VoiceLibrary:
         self._ensure_library_dir()
         self._metadata = self._load_metadata()
         self._config = self._load_config()
+        # Bumped on every saved change, so callers can cache lookups per generation
+        self.generation = 0
     
     def _ensure_library_dir(self):
         """Ensure the voice library directory exists"""
@@ -41,6 +43,7 @@ class VoiceLibrary:
     
     def _save_metadata(self):
         """Save voice metadata to JSON file"""
+        self.generation += 1
         with open(self.metadata_file, 'w', encoding='utf-8') as f:
             json.dump(self._metadata, f, indent=2, ensure_ascii=False)
     
@@ -62,6 +65,7 @@ class VoiceLibrary:
     def _save_config(self):
         """Save configuration to JSON file"""
         self._config["last_updated"] = datetime.now().isoformat()
+        self.generation += 1
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(self._config, f, indent=2, ensure_ascii=False)
     
@@ -0,0 +1,220 @@
+"""
+Storage for voice samples uploaded with TTS requests
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Per-request copies of uploaded samples are only read back once by the model,
+# so they go to VOICE_TEMP_DIR (tmpfs by default) instead of a disk-backed /tmp
+VOICE_TMPDIR = Config.VOICE_TEMP_DIR
+
+# Uploaded voice samples can be kept on disk by content hash, so re-uploading the
+# same sample reuses its file and its cached conditionals. The store is bounded
+# by total size (least recently used first out); 0, the default, disables it.
+VOICE_UPLOAD_CACHE_DIR = Config.VOICE_UPLOAD_CACHE_DIR
+VOICE_UPLOAD_CACHE_BYTES = Config.VOICE_UPLOAD_CACHE_MB * 1024 * 1024
+
+# Stored samples unused for VOICE_UPLOAD_MAX_AGE are deleted; per-request temp
+# files left behind (e.g. by a worker killed mid-request) are swept once older
+# than VOICE_TEMPFILE_MAX_AGE. Sweeps run on startup and then every
+# VOICE_TEMPFILE_SWEEP_INTERVAL (all in seconds).
+VOICE_UPLOAD_MAX_AGE = 24 * 3600
+VOICE_TEMPFILE_MAX_AGE = 3600
+VOICE_TEMPFILE_SWEEP_INTERVAL = 600
+
+_TEMP_PREFIX = "voice_sample_"
+_STORED_PREFIX = "voice_cache_"
+
+# Stored path -> (size in bytes, last use), most recently used last. Requests
+# use it from the event loop and the sweeper from a worker thread, so every
+# access holds _lock.
+_voice_uploads: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_voice_upload_bytes = 0
+# Stored paths in use by running requests -> number of requests; never deleted
+_pinned: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _voice_upload_path(digest: str, file_ext: str) -> str:
+    return os.path.join(VOICE_UPLOAD_CACHE_DIR, f"{_STORED_PREFIX}{digest}{file_ext}")
+
+
+def _unlink_all(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _track(voice_path: str, size: int, last_used: float) -> None:
+    """Add or refresh an index entry as most recently used. Caller holds _lock."""
+    global _voice_upload_bytes
+    previous = _voice_uploads.pop(voice_path, None)
+    if previous is not None:
+        _voice_upload_bytes -= previous[0]
+    _voice_uploads[voice_path] = (size, last_used)
+    _voice_upload_bytes += size
+
+
+def _untrack(voice_path: str) -> None:
+    """Drop an index entry. Caller holds _lock."""
+    global _voice_upload_bytes
+    size, _ = _voice_uploads.pop(voice_path)
+    _voice_upload_bytes -= size
+
+
+def _evict() -> List[str]:
+    """Untrack unpinned samples, least recently used first, until the store fits. Caller holds _lock."""
+    evicted = []
+    for voice_path in list(_voice_uploads):
+        if _voice_upload_bytes <= VOICE_UPLOAD_CACHE_BYTES:
+            break
+        if voice_path not in _pinned:
+            _untrack(voice_path)
+            evicted.append(voice_path)
+    return evicted
+
+
+def _use(voice_path: str, size: int) -> None:
+    """Pin a stored sample for a request and mark it most recently used, evicting others to fit"""
+    now = time.time()
+    with _lock:
+        _pinned[voice_path] = _pinned.get(voice_path, 0) + 1
+        _track(voice_path, size, now)
+        evicted = _evict()
+    _unlink_all(evicted)
+    try:
+        # Record the use in atime, so a restarted server keeps the LRU order. The
+        # mtime stays put: it keys the encoded conditionals of the sample.
+        os.utime(voice_path, ns=(time.time_ns(), os.stat(voice_path).st_mtime_ns))
+    except OSError:
+        pass
+
+
+def voice_upload_cacheable(file_size: int) -> bool:
+    """Whether an upload of this size can be kept in the upload store"""
+    return 0 < file_size <= VOICE_UPLOAD_CACHE_BYTES
+
+
+def find_voice_upload(digest: str, file_ext: str) -> Optional[str]:
+    """
+    Path of an already stored sample with this content, or None.
+
+    The stored file is reused untouched and pinned until release_voice_upload.
+    """
+    voice_path = _voice_upload_path(digest, file_ext)
+    try:
+        size = os.stat(voice_path).st_size
+    except OSError:
+        return None
+    _use(voice_path, size)
+    return voice_path
+
+
+def voice_upload_tempfile(file_ext: str, cacheable: bool) -> Tuple[int, str]:
+    """
+    Create a temp file for an incoming upload and return (fd, path).
+
+    Uploads headed for the store are staged in its directory, so storing them
+    is a rename; the rest go to VOICE_TMPDIR.
+    """
+    if cacheable:
+        os.makedirs(VOICE_UPLOAD_CACHE_DIR, exist_ok=True)
+    return tempfile.mkstemp(suffix=file_ext, prefix=_TEMP_PREFIX,
+                            dir=VOICE_UPLOAD_CACHE_DIR if cacheable else VOICE_TMPDIR)
+
+
+def store_voice_upload(temp_voice_path: str, digest: str, file_ext: str, file_size: int) -> str:
+    """Move an upload staged by voice_upload_tempfile into the store and return its pinned path"""
+    voice_path = _voice_upload_path(digest, file_ext)
+    os.replace(temp_voice_path, voice_path)
+    _use(voice_path, file_size)
+    return voice_path
+
+
+def release_voice_upload(voice_path: str) -> None:
+    """Unpin a stored sample once its request is done with it"""
+    with _lock:
+        count = _pinned.get(voice_path, 0) - 1
+        if count > 0:
+            _pinned[voice_path] = count
+        else:
+            _pinned.pop(voice_path, None)
+        evicted = _evict()
+    _unlink_all(evicted)
+
+
+def _scan(directory: str, prefixes: Tuple[str, ...], found: Dict[str, Tuple[str, os.stat_result]]) -> None:
+    """Add the files in directory named with one of prefixes to found, as path -> (name, stat)"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(prefixes):
+                try:
+                    found[entry.path] = (entry.name, entry.stat())
+                except OSError:
+                    pass
+
+
+def sweep_voice_tempfiles() -> int:
+    """
+    Expire stored samples and delete orphaned temp files; returns the number deleted.
+
+    Stored samples on disk that aren't in the index (left by an earlier run or
+    another worker) are taken in first, ordered by their last use, so they
+    count against the size limit and expire like the rest.
+    """
+    now = time.time()
+    found: Dict[str, Tuple[str, os.stat_result]] = {}
+    _scan(VOICE_TMPDIR, (_TEMP_PREFIX,), found)
+    if VOICE_UPLOAD_CACHE_BYTES and os.path.isdir(VOICE_UPLOAD_CACHE_DIR):
+        _scan(VOICE_UPLOAD_CACHE_DIR, (_TEMP_PREFIX, _STORED_PREFIX), found)
+
+    deleted = []
+    with _lock:
+        adopted = [(st.st_atime, path, st.st_size) for path, (name, st) in found.items()
+                   if name.startswith(_STORED_PREFIX) and path not in _voice_uploads]
+        if adopted:
+            for last_used, voice_path, size in adopted:
+                _track(voice_path, size, last_used)
+            ordered = sorted(_voice_uploads.items(), key=lambda item: item[1][1])
+            _voice_uploads.clear()
+            _voice_uploads.update(ordered)
+        for voice_path, (_, last_used) in list(_voice_uploads.items()):
+            if last_used < now - VOICE_UPLOAD_MAX_AGE:
+                # Every request pins with a fresh last use, so a pin this old was
+                # leaked by a response whose body never started
+                _pinned.pop(voice_path, None)
+                _untrack(voice_path)
+                deleted.append(voice_path)
+        deleted.extend(_evict())
+
+    # Temp copies and staging files only live for one request
+    cutoff = now - VOICE_TEMPFILE_MAX_AGE
+    deleted.extend(path for path, (name, st) in found.items()
+                   if name.startswith(_TEMP_PREFIX) and st.st_mtime < cutoff)
+    _unlink_all(deleted)
+    return len(deleted)
+
+
+async def sweep_voice_tempfiles_periodically() -> None:
+    """Run sweep_voice_tempfiles now and every VOICE_TEMPFILE_SWEEP_INTERVAL seconds until cancelled"""
+    while True:
+        try:
+            removed = await asyncio.to_thread(sweep_voice_tempfiles)
+            if removed:
+                logger.info("Removed %d expired or orphaned voice upload files", removed)
+        except OSError as e:
+            logger.warning("Voice temp file sweep failed: %s", e)
+        await asyncio.sleep(VOICE_TEMPFILE_SWEEP_INTERVAL)
@@ -2,6 +2,7 @@
 Main FastAPI application
 """
 
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,8 +11,16 @@ from fastapi.responses import JSONResponse
 from app.core.tts_model import initialize_model
 from app.core.voice_library import get_voice_library
 from app.api.router import api_router
+from app.core.voice_uploads import sweep_voice_tempfiles_periodically
 from app.config import Config
 
+# Application loggers (per-chunk generation progress etc.); formatted like uvicorn's.
+# An unknown LOG_LEVEL (e.g. a typo) falls back to INFO instead of failing startup.
+_log_level_known = isinstance(logging.getLevelName(Config.LOG_LEVEL), int)
+logging.basicConfig(level=Config.LOG_LEVEL if _log_level_known else logging.INFO,
+                    format="%(levelname)s:     %(message)s")
+if not _log_level_known:
+    logging.getLogger(__name__).warning("Unknown LOG_LEVEL %r, using INFO", Config.LOG_LEVEL)
 
 ascii_art = r"""
   ____ _           _   _            _               
@@ -35,6 +44,9 @@ async def lifespan(app: FastAPI):
     import asyncio
     model_init_task = asyncio.create_task(initialize_model())
     
+    # Periodically remove voice upload files orphaned by interrupted requests
+    voice_sweep_task = asyncio.create_task(sweep_voice_tempfiles_periodically())
+    
     # Initialize voice library to restore default voice settings
     print("Initializing voice library...")
     voice_lib = get_voice_library()
@@ -50,6 +62,8 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown (cleanup if needed)
+    voice_sweep_task.cancel()
+    
     # Cancel model initialization if it's still running
     if not model_init_task.done():
         model_init_task.cancel()
@@ -280,6 +280,25 @@ class TestErrorHandling:
         )
         assert response.status_code == 400  # Text too long
 
+    def test_oversize_voice_upload(self, api_client):
+        """Test voice file over the 25MB limit (upload)"""
+        oversize_wav = b"RIFF\x24\x00\x00\x00WAVEfmt " + b"\x00" * (25 * 1024 * 1024 + 1)
+        response = api_client.post(
+            "/v1/audio/speech/upload",
+            data={"input": "test"},
+            files={"voice_file": ("voice.wav", oversize_wav, "audio/wav")}
+        )
+        assert response.status_code == 413  # File too large
+
+    def test_mislabeled_voice_upload(self, api_client):
+        """Test text content uploaded with a .wav name (upload)"""
+        response = api_client.post(
+            "/v1/audio/speech/upload",
+            data={"input": "test"},
+            files={"voice_file": ("voice.wav", b"This is not an audio file", "audio/wav")}
+        )
+        assert response.status_code == 400  # Not a recognized audio file
+
 
 class TestConcurrentRequests:
     """Test concurrent request handling"""
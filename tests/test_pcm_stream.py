@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming PCM helpers in the speech endpoint:
+WAV header bytes, chunk crossfading and int16 quantization
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+speech = pytest.importorskip("app.api.endpoints.speech")
+
+pytestmark = pytest.mark.unit
+
+SAMPLE_RATE = 24000
+FADE = 240  # 10 ms at 24 kHz, as used by generate_speech_streaming
+
+
+@pytest.fixture(scope="module", autouse=True)
+def check_api_health():
+    """These tests call the helpers directly; no running API is needed"""
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernel_path(request, monkeypatch):
+    """Run a test once through the numba kernels and once through the NumPy fallback"""
+    if request.param == "numba":
+        if speech.numba is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(speech, "numba", None)
+    return request.param
+
+
+def quantize(pcm):
+    """Reference int16 quantization in float32: clip, scale, truncate toward zero"""
+    return (np.clip(pcm, -1, 1) * np.float32(32767.0)).astype(np.int16)
+
+
+def overlap_add(chunks, fade_samples):
+    """Reference output: consecutive chunks overlapped by fade_samples with a linear ramp"""
+    ramp = np.linspace(0, 1, fade_samples, endpoint=False, dtype=np.float32)
+    out = chunks[0][0].copy()
+    for chunk in chunks[1:]:
+        seam = out[-fade_samples:] + (chunk[0, :fade_samples] - out[-fade_samples:]) * ramp
+        out = np.concatenate([out[:-fade_samples], seam, chunk[0, fade_samples:]])
+    return out
+
+
+def stream_chunks(chunks, fade_samples):
+    """Feed chunks through a _CrossfadeStream and return the int16 samples it emitted"""
+    stream = speech._CrossfadeStream(fade_samples)
+    blocks = [stream.feed(np_pcm.copy()) for np_pcm in chunks]
+    blocks.append(stream.flush())
+    return np.frombuffer(b"".join(blocks), dtype="<i2")
+
+
+def random_chunks(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(-1.2, 1.2, size=(1, n)).astype(np.float32) for n in lengths]
+
+
+class TestWavHeader:
+    """_wav_header packs a canonical 44-byte streaming header"""
+
+    def test_pcm16_header_bytes(self):
+        header = speech._wav_header(SAMPLE_RATE)
+        assert len(header) == 44
+        assert header == (
+            b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF)
+        )
+
+    def test_float32_stereo_header_fields(self):
+        header = speech._wav_header(44100, channels=2, bits=32, fmt=3)
+        fmt_fields = struct.unpack_from("<HHIIHH", header, 20)
+        assert fmt_fields == (3, 2, 44100, 44100 * 8, 8, 32)
+
+    def test_header_is_cached(self):
+        assert speech._wav_header(SAMPLE_RATE) is speech._wav_header(SAMPLE_RATE)
+
+
+class TestCrossfade:
+    """crossfade_pcm blends exactly fade_samples and keeps the rest of the chunk"""
+
+    def test_seam_length(self, kernel_path):
+        prev_pcm, next_pcm = random_chunks([1000, 800])
+        blended, rest = speech.crossfade_pcm(prev_pcm, next_pcm, FADE)
+        assert blended.shape == (1, FADE)
+        assert rest.shape == (1, 800 - FADE)
+        np.testing.assert_array_equal(rest, next_pcm[:, FADE:])
+
+    def test_seam_endpoints(self, kernel_path):
+        prev_pcm = np.full((1, FADE), 0.5, dtype=np.float32)
+        next_pcm = np.full((1, FADE * 2), -0.5, dtype=np.float32)
+        blended, _ = speech.crossfade_pcm(prev_pcm, next_pcm, FADE)
+        assert blended[0, 0] == pytest.approx(0.5)
+        assert blended[0, -1] == pytest.approx(-0.5, abs=2.0 / FADE)
+
+    def test_short_chunk_is_not_blended(self, kernel_path):
+        prev_pcm, next_pcm = random_chunks([1000, FADE - 1])
+        blended, rest = speech.crossfade_pcm(prev_pcm, next_pcm, FADE)
+        assert blended is None
+        assert rest is next_pcm
+
+
+class TestToPcm16:
+    """_to_pcm16 quantizes every sample of every part, in order"""
+
+    def test_parts_written_back_to_back(self, kernel_path):
+        parts = random_chunks([300, 7, 1])
+        expected = np.concatenate([quantize(p)[0] for p in parts])
+        pcm_bytes, _ = speech._to_pcm16([p.copy() for p in parts], np.empty(0, dtype=np.int16))
+        assert len(pcm_bytes) == 2 * expected.size
+        np.testing.assert_array_equal(np.frombuffer(pcm_bytes, dtype="<i2"), expected)
+
+    def test_larger_scratch_does_not_pad_output(self, kernel_path):
+        (part,) = random_chunks([50])
+        pcm_bytes, scratch = speech._to_pcm16([part.copy()], np.empty(4096, dtype=np.int16))
+        assert len(pcm_bytes) == 100
+        assert scratch.size == 4096
+
+    def test_clipping(self, kernel_path):
+        part = np.array([[-2.0, -1.0, 0.0, 1.0, 2.0]], dtype=np.float32)
+        pcm_bytes, _ = speech._to_pcm16([part], np.empty(0, dtype=np.int16))
+        assert np.frombuffer(pcm_bytes, dtype="<i2").tolist() == [-32767, -32767, 0, 32767, 32767]
+
+
+class TestCrossfadeStream:
+    """_CrossfadeStream output adds up to the overlap-added signal"""
+
+    def test_no_dropped_tail(self, kernel_path):
+        chunks = random_chunks([4800, 3000, 5000])
+        out = stream_chunks(chunks, FADE)
+        assert out.size == sum(c.shape[1] for c in chunks) - 2 * FADE
+        assert abs(int(out[-1]) - int(quantize(chunks[-1])[0, -1])) <= 1
+
+    def test_matches_overlap_add(self, kernel_path):
+        chunks = random_chunks([4800, 3000, 5000], seed=1)
+        out = stream_chunks(chunks, FADE)
+        expected = quantize(overlap_add(chunks, FADE))
+        if kernel_path == "numpy":
+            np.testing.assert_array_equal(out, expected)
+        else:
+            # fastmath may reassociate the blend; allow one LSB of difference
+            assert np.abs(out.astype(np.int32) - expected).max() <= 1
+
+    def test_short_chunk_passes_tail_through(self, kernel_path):
+        chunks = random_chunks([1000, FADE // 2, 1000], seed=2)
+        out = stream_chunks(chunks, FADE)
+        assert out.size == sum(c.shape[1] for c in chunks)
+        np.testing.assert_array_equal(out[1000 - FADE:1000], quantize(chunks[0][:, -FADE:])[0])
+
+    def test_flush_is_empty_without_tail(self):
+        stream = speech._CrossfadeStream(FADE)
+        assert stream.flush() == b""
+        stream.feed(random_chunks([1000])[0])
+        assert len(stream.flush()) == 2 * FADE
+        assert stream.flush() == b""
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for voice upload validation in the speech endpoint:
+audio signature sniffing and the upload size limit
+"""
+
+import asyncio
+import io
+
+import pytest
+
+speech = pytest.importorskip("app.api.endpoints.speech")
+from fastapi import HTTPException
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module", autouse=True)
+def check_api_health():
+    """These tests call the helpers directly; no running API is needed"""
+
+
+class FakeUpload:
+    """The parts of UploadFile that hash_voice_upload uses"""
+
+    def __init__(self, content: bytes):
+        self.file = io.BytesIO(content)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    async def seek(self, offset: int) -> None:
+        self.file.seek(offset)
+
+
+def hash_upload(content: bytes):
+    return asyncio.run(speech.hash_voice_upload(FakeUpload(content)))
+
+
+ACCEPTED_HEADS = {
+    "wav": b"RIFF\x24\x00\x00\x00WAVEfmt ",
+    "rf64": b"RF64\xff\xff\xff\xffWAVEds64",
+    "flac": b"fLaC\x00\x00\x00\x22",
+    "ogg": b"OggS\x00\x02\x00\x00",
+    "mp3_id3": b"ID3\x04\x00\x00\x00\x00",
+    "mp3_frame_sync": b"\xff\xfb\x90\x64\x00\x00",
+    "m4a": b"\x00\x00\x00\x20ftypM4A ",
+}
+
+REJECTED_HEADS = {
+    "text": b"This is not an audio file",
+    "html": b"<!DOCTYPE html><html>",
+    "avi": b"RIFF\x24\x00\x00\x00AVI LIST",
+    "empty": b"",
+    "single_ff": b"\xff",
+}
+
+
+class TestAudioSignatures:
+    """_looks_like_audio accepts each supported container and nothing else"""
+
+    @pytest.mark.parametrize("head", ACCEPTED_HEADS.values(), ids=ACCEPTED_HEADS.keys())
+    def test_accepted_signature(self, head):
+        assert speech._looks_like_audio(head)
+
+    @pytest.mark.parametrize("head", REJECTED_HEADS.values(), ids=REJECTED_HEADS.keys())
+    def test_rejected_content(self, head):
+        assert not speech._looks_like_audio(head)
+
+
+class TestHashVoiceUpload:
+    """hash_voice_upload rejects bad uploads while reading them"""
+
+    @pytest.mark.parametrize("head", ACCEPTED_HEADS.values(), ids=ACCEPTED_HEADS.keys())
+    def test_accepted_upload(self, head):
+        content = head + b"\x00" * 64
+        size, digest = hash_upload(content)
+        assert size == len(content)
+        assert digest == hash_upload(content)[1]
+
+    def test_mislabeled_text_is_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            hash_upload(b"Just some text saved as voice.wav\n" * 10)
+        assert exc_info.value.status_code == 400
+
+    def test_empty_upload_is_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            hash_upload(b"")
+        assert exc_info.value.status_code == 400
+
+    def test_oversize_upload_is_413(self):
+        content = ACCEPTED_HEADS["wav"] + b"\x00" * speech.MAX_VOICE_FILE_SIZE
+        with pytest.raises(HTTPException) as exc_info:
+            hash_upload(content)
+        assert exc_info.value.status_code == 413
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the WAV header helpers shared by the streaming examples
+"""
+
+import io
+import struct
+
+import pytest
+
+from wav_stream_utils import check_riff_magic, parse_wav_header, read_wav_header
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module", autouse=True)
+def check_api_health():
+    """These tests parse bytes only; no running API is needed"""
+
+
+def fmt_chunk(channels=1, sample_rate=24000, bits=16, audio_format=1):
+    block_align = channels * bits // 8
+    body = struct.pack('<HHIIHH', audio_format, channels, sample_rate,
+                       sample_rate * block_align, block_align, bits)
+    return b'fmt ' + struct.pack('<I', len(body)) + body
+
+
+def wav_bytes(*chunks, data=b''):
+    """RIFF/WAVE preamble, the given chunks, then a data chunk holding `data`"""
+    body = b'WAVE' + b''.join(chunks) + b'data' + struct.pack('<I', len(data)) + data
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+class TestParseWavHeader:
+    """parse_wav_header reads the fmt fields wherever the fmt chunk is"""
+
+    def test_canonical_44_byte_header(self):
+        header = wav_bytes(fmt_chunk())
+        assert len(header) == 44
+        assert parse_wav_header(header) == (1, 24000, 16, 1)
+
+    def test_fmt_after_list_chunk(self):
+        list_chunk = b'LIST' + struct.pack('<I', 4) + b'INFO'
+        header = wav_bytes(list_chunk, fmt_chunk(channels=2, sample_rate=44100, bits=32, audio_format=3))
+        assert parse_wav_header(header) == (2, 44100, 32, 3)
+
+    def test_html_body_raises(self):
+        with pytest.raises(ValueError):
+            parse_wav_header(b'<html><body>502 Bad Gateway</body></html>')
+
+
+class TestReadWavHeader:
+    """read_wav_header stops exactly at the start of the audio data"""
+
+    def test_canonical_header(self):
+        audio = bytes(range(10))
+        header, remainder = read_wav_header(io.BytesIO(wav_bytes(fmt_chunk(), data=audio)))
+        assert len(header) == 44
+        assert remainder == audio
+
+    def test_list_chunk_before_data(self):
+        list_chunk = b'LIST' + struct.pack('<I', 4) + b'INFO'
+        audio = b'\x01\x02\x03\x04'
+        header, remainder = read_wav_header(io.BytesIO(wav_bytes(fmt_chunk(), list_chunk, data=audio)))
+        assert header.endswith(b'data' + struct.pack('<I', len(audio)))
+        assert len(header) == 44 + len(list_chunk)
+        assert remainder == audio
+
+    def test_odd_sized_chunk_is_padded(self):
+        # A 3-byte chunk is followed by one pad byte before the next chunk
+        odd_chunk = b'junk' + struct.pack('<I', 3) + b'abc' + b'\x00'
+        audio = b'\x05\x06'
+        header, remainder = read_wav_header(io.BytesIO(wav_bytes(fmt_chunk(), odd_chunk, data=audio)))
+        assert len(header) == 44 + len(odd_chunk)
+        assert remainder == audio
+
+    def test_header_split_across_reads(self):
+        class Trickle(io.BytesIO):
+            def read(self, n=-1):
+                return super().read(min(n, 5))
+
+        audio = b'\x07' * 8
+        header, remainder = read_wav_header(Trickle(wav_bytes(fmt_chunk(), data=audio)))
+        assert len(header) == 44
+        assert audio.startswith(remainder)
+
+    def test_html_body_raises(self):
+        with pytest.raises(ValueError):
+            read_wav_header(io.BytesIO(b'<!DOCTYPE html><html><body>Internal Server Error</body></html>'))
+
+    def test_empty_body_raises(self):
+        with pytest.raises(RuntimeError):
+            read_wav_header(io.BytesIO(b''))
+
+
+class TestCheckRiffMagic:
+    """check_riff_magic only accepts a RIFF/WAVE preamble"""
+
+    def test_accepts_wav(self):
+        check_riff_magic(wav_bytes(fmt_chunk()))
+
+    @pytest.mark.parametrize("body", [
+        b'<html><head><title>Error</title></head></html>',
+        b'{"error": {"message": "Model not loaded"}}',
+        b'RIFF\x00\x00\x00\x00AVI LIST',
+        b'RIFF',
+    ])
+    def test_rejects_non_wav(self, body):
+        with pytest.raises(ValueError):
+            check_riff_magic(body)
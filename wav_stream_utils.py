@@ -0,0 +1,296 @@
+"""
+Shared helpers for the streaming playback examples
+
+Both StreamingExampleUsing*.py scripts request, parse and buffer the
+streamed WAV the same way; the code lives here so the two stay in sync
+and each script only holds its playback backend.
+"""
+
+import collections
+import contextlib
+import socket
+import struct
+import threading
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+# 32 KiB per read: a whole number of frames for every supported sample format
+# (2/4 bytes per sample, 1-2 channels) and ~10x fewer Python round-trips than 4 KiB
+CHUNK_SIZE = 32768
+# Small reads while looking for the start of the audio data
+HEADER_READ_SIZE = 1024
+# RIFF preamble: "RIFF", riff size, "WAVE"
+_RIFF_HDR = struct.Struct('<4sI4s')
+# fmt chunk body: audio_format, channels, sample_rate,
+# byte_rate, block_align, bits_per_sample
+_WAV_FMT = struct.Struct('<HHIIHH')
+# Canonical layout with fmt as the first chunk (what the server sends):
+# preamble, fmt chunk id/size and fmt body in one unpack
+_CANONICAL_HDR = struct.Struct('<4sI4s4sIHHIIHH')
+
+
+# Target amount of audio buffered between the network and the audio device
+BUFFER_MS = 400
+# Audio accumulated before playback starts, so the device never starts starved
+PREROLL_MS = 200
+# Frames per device buffer
+BLOCKSIZE = 1024
+# Playback volume; at 1.0 samples are passed through without any processing
+GAIN = 1.0
+
+# Kernel receive buffer for the audio socket: room to absorb ~21 s of the
+# 24 kHz int16 mono audio the server sends while the reader is briefly busy
+RCVBUF_BYTES = 1 << 20
+
+
+class StreamingAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets get a larger receive buffer"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def make_session():
+    """Create a keep-alive HTTP session for streaming requests.
+
+    Reusing the session's connection pool skips TCP setup on repeated
+    requests, and its sockets keep urllib3's TCP_NODELAY default plus a
+    larger SO_RCVBUF so network jitter is absorbed by the kernel instead of
+    stalling the sender. PCM does not compress, so the session asks for an
+    identity encoding and callers can read the raw body with no decoder in
+    the path.
+    """
+    session = requests.Session()
+    adapter = StreamingAdapter(pool_maxsize=4, pool_block=False)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = 'identity'
+    return session
+
+
+def check_riff_magic(header_bytes):
+    """Raise ValueError unless the bytes start with a RIFF/WAVE preamble.
+
+    Catches error pages or other non-WAV bodies before they are parsed as
+    fmt fields or played as samples.
+    """
+    if len(header_bytes) < _RIFF_HDR.size:
+        raise ValueError("Header too short for WAV file")
+    riff, _riff_size, wave = _RIFF_HDR.unpack_from(header_bytes)
+    if riff != b'RIFF' or wave != b'WAVE':
+        raise ValueError(f"Not a WAV stream (starts with {bytes(header_bytes[:12])!r})")
+
+
+def parse_wav_header(header_bytes):
+    """Return (channels, sample_rate, bits_per_sample, audio_format) from the fmt chunk"""
+    if len(header_bytes) >= _CANONICAL_HDR.size and header_bytes[12:16] == b'fmt ':
+        (riff, _riff_size, wave, _fmt_id, _fmt_size, audio_format, channels,
+         sample_rate, _byte_rate, _block_align, bits_per_sample) = _CANONICAL_HDR.unpack_from(header_bytes)
+        if riff == b'RIFF' and wave == b'WAVE':
+            return channels, sample_rate, bits_per_sample, audio_format
+    check_riff_magic(header_bytes)
+    fmt_off = header_bytes.find(b'fmt ', 12)
+    if fmt_off < 0 or len(header_bytes) < fmt_off + 8 + _WAV_FMT.size:
+        raise ValueError("WAV header has no complete fmt chunk")
+    audio_format, channels, sample_rate, _byte_rate, _block_align, bits_per_sample = (
+        _WAV_FMT.unpack_from(header_bytes, fmt_off + 8)
+    )
+    return channels, sample_rate, bits_per_sample, audio_format
+
+
+def read_wav_header(raw):
+    """Read from a raw response stream until the start of the `data` chunk.
+
+    Walks the RIFF chunk list rather than assuming a 44-byte header, so
+    LIST/bext/extended fmt chunks are skipped instead of played as audio.
+    The RIFF/WAVE magic is checked as soon as the first 12 bytes arrive.
+    Returns the header bytes and any audio bytes that arrived with them.
+    """
+    header = bytearray()
+    pos = 12  # first chunk after "RIFF" <size> "WAVE"
+    checked = False
+    while True:
+        if not checked and len(header) >= _RIFF_HDR.size:
+            check_riff_magic(header)
+            checked = True
+        while checked and pos + 8 <= len(header):
+            if header[pos:pos + 4] == b'data':
+                audio_start = pos + 8
+                return bytes(header[:audio_start]), bytes(header[audio_start:])
+            size = int.from_bytes(header[pos + 4:pos + 8], "little")
+            pos += 8 + size + (size & 1)  # chunks are word-aligned
+        chunk = raw.read(HEADER_READ_SIZE)
+        if not chunk:
+            raise RuntimeError("No WAV header received")
+        header += chunk
+
+
+class PCMBuffer:
+    """Bounded, thread-safe byte FIFO between the network thread and PortAudio.
+
+    `put` blocks while the buffer is full, which gives the network thread
+    backpressure; `read` never blocks so it is safe to call from the audio
+    callback. `put(None)` marks the end of the stream.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.finished = False
+        self._chunks = collections.deque()
+        self._offset = 0  # bytes already consumed from self._chunks[0]
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def put(self, chunk):
+        with self._cond:
+            if chunk is None:
+                self.finished = True
+                self._cond.notify_all()
+                return
+            while self._size >= self.capacity:
+                self._cond.wait()
+            self._chunks.append(chunk)
+            self._size += len(chunk)
+            self._cond.notify_all()
+
+    def wait_for(self, n):
+        """Block until at least `n` bytes are buffered or the stream has ended"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._size >= n or self.finished)
+
+    def read(self, n):
+        """Return up to `n` bytes; fewer only if the buffer runs dry"""
+        out = bytearray()
+        with self._cond:
+            while n > 0 and self._chunks:
+                head = self._chunks[0]
+                take = head[self._offset:self._offset + n]
+                out += take
+                n -= len(take)
+                self._offset += len(take)
+                if self._offset == len(head):
+                    self._chunks.popleft()
+                    self._offset = 0
+            self._size -= len(out)
+            self._cond.notify_all()
+        return bytes(out)
+
+
+def start_producer(raw, remainder, frame_bytes, sink, transform=None):
+    """Read the response body on a background thread into `sink`.
+
+    Reads land in one reusable bytearray via `readinto`; each chunk passed to
+    `sink.put` is a single copy holding whole frames only, with any partial
+    frame kept at the front of the buffer for the next read. `sink.put(None)`
+    marks the end of the stream. If given, `transform` is applied to each
+    chunk before it is handed over. Returns a list that receives any exception
+    raised while reading.
+    """
+    errors = []
+
+    def put(chunk):
+        sink.put(transform(chunk) if transform else chunk)
+
+    def run():
+        try:
+            aligned = len(remainder) - len(remainder) % frame_bytes
+            if aligned:
+                put(remainder[:aligned])
+            buf = bytearray(CHUNK_SIZE)
+            view = memoryview(buf)
+            filled = len(remainder) - aligned
+            view[:filled] = remainder[aligned:]
+            while (n := raw.readinto(view[filled:])):
+                filled += n
+                aligned = filled - filled % frame_bytes
+                if aligned:
+                    put(bytes(view[:aligned]))
+                    filled -= aligned
+                    view[:filled] = view[aligned:aligned + filled]
+        except Exception as e:
+            errors.append(e)
+        finally:
+            sink.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+    return errors
+
+
+class GainStage:
+    """Scale PCM chunks by a constant gain.
+
+    Samples are viewed in place with np.frombuffer and scaled into one
+    reusable float32 scratch buffer, so the only allocation per chunk is the
+    returned bytes. Only build one when the gain is not 1.0; at unity gain the
+    bytes should be passed through untouched.
+    """
+
+    def __init__(self, dtype, gain):
+        self.dtype = np.dtype(dtype)
+        self.gain = gain
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def __call__(self, chunk):
+        samples = np.frombuffer(chunk, dtype=self.dtype)
+        if self._scratch.size < samples.size:
+            self._scratch = np.empty(samples.size, dtype=np.float32)
+        out = self._scratch[:samples.size]
+        np.multiply(samples, self.gain, out=out)
+        if self.dtype == np.int16:
+            np.clip(out, -32768, 32767, out=out)
+            return out.astype(np.int16).tobytes()
+        np.clip(out, -1.0, 1.0, out=out)
+        return out.tobytes()
+
+
+# An open stream as handed to the playback backends: the format, the PCMBuffer
+# the producer thread fills, and the list that receives its read errors
+PCMStream = collections.namedtuple(
+    'PCMStream', 'channels sample_rate bits_per_sample dtype frame_bytes buffer errors'
+)
+
+_session = None
+
+
+@contextlib.contextmanager
+def open_stream(url, payload):
+    """POST a streaming TTS request and start buffering its audio.
+
+    Parses the WAV header, starts the producer thread filling a PCMBuffer of
+    BUFFER_MS (with GAIN applied) and waits for PREROLL_MS of audio before
+    yielding a PCMStream. The response is released on exit.
+    """
+    global _session
+    if _session is None:
+        _session = make_session()
+    with _session.post(url, json=payload, stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = False  # identity-encoded PCM, skip the decoder
+
+        wav_header, remainder = read_wav_header(r.raw)
+        channels, sr, bits_per_sample, audio_format = parse_wav_header(wav_header)
+        if audio_format == 1 and bits_per_sample == 16:
+            dtype = 'int16'
+        elif audio_format == 3 and bits_per_sample == 32:
+            dtype = 'float32'
+        else:
+            raise RuntimeError(f"Unsupported audio format: {audio_format} with {bits_per_sample} bits")
+
+        print(f"Sample Rate: {sr}, Channels: {channels}, Bits: {bits_per_sample}, Format: {audio_format}, dtype: {dtype}")
+
+        # Network reads happen on a producer thread that fills a bounded
+        # buffer; the audio backend pulls from it on its own thread, so the
+        # socket keeps being read while the device drains
+        frame_bytes = channels * bits_per_sample // 8
+        pcm = PCMBuffer(capacity=sr * frame_bytes * BUFFER_MS // 1000)
+        transform = GainStage(dtype, GAIN) if GAIN != 1.0 else None
+        errors = start_producer(r.raw, remainder, frame_bytes, pcm, transform)
+
+        pcm.wait_for(sr * frame_bytes * PREROLL_MS // 1000)
+        yield PCMStream(channels, sr, bits_per_sample, dtype, frame_bytes, pcm, errors)